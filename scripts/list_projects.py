@@ -1,172 +1,147 @@
 import os
 import re
+import sys
+import argparse
 import pandas as pd
 
-from difflib import SequenceMatcher
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
 
-def extract_project_id(input_string):
-    """
-    Splits an input string into two parts based on a regex pattern that matches
-    four digits followed by a '-' at the start of the string.
+from utils.similarity import filter_dataframe_by_similarity
 
-    Args:
-        input_string (str): The input string to be processed.
+# Compiled once at import; these are matched against every subdirectory in the archive
+_PROJECT_ID_RE = re.compile(r"^(\d{4}) - (.+)$")
+_PROJECT_DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}) - (.+)$")
 
-    Returns:
-        tuple: A tuple containing two strings:
-               - The first string is the four digits if a match is found, otherwise an empty string.
-               - The second string is the part of the input string after the '-' if a match is found, otherwise the entire input string.
-    """
-    # Define the regex pattern
-    pattern = r"^(\d{4}) - (.+)$"
-    
-    # Search for the pattern in the input string
-    match = re.match(pattern, input_string)
-    
-    if match:
-        # Extract the four digits and the part after the '-'
-        return match.group(1), match.group(2)
-    else:
-        # Return empty string and the full input string if no match is found
-        return "", input_string
+# The Parquet file the bot loads at startup
+PROJECTS_PARQUET = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "projects.parquet")
+
+# The legacy CSV joined each project's files with spaces; file names contain spaces too, so
+# only split on a space that follows one of the document extensions found in the archive
+_LEGACY_FILE_EXTENSIONS = ("pdf", "docx", "doc", "xlsx", "xls", "pptx", "ppt", "vsdx", "indd", "eml", "msg", "jpg", "jpeg", "png")
+_LEGACY_FILES_SPLIT_RE = re.compile("|".join(rf"(?<=\.{ext}) " for ext in _LEGACY_FILE_EXTENSIONS), re.IGNORECASE)
 
-def extract_project_date(input_string):
+def extract_project_columns(names):
     """
-    Splits an input string into two parts based on a regex pattern that matches
-    a date followed by a '-' at the start of the string.
+    Splits a Series of subdirectory names into project ids and project names, all at once.
+
+    A leading four-digit project id followed by ' - ' is split off as the ID, then a leading
+    date followed by ' - ' is stripped from the rest of the name.
 
     Args:
-        input_string (str): The input string to be processed.
+        names (pd.Series): The subdirectory names to be processed.
 
     Returns:
-        tuple: A tuple containing two strings:
-               - The first string is the date if a match is found, otherwise an empty string.
-               - The second string is the part of the input string after the '-' if a match is found, otherwise the entire input string.
+        pd.DataFrame: A DataFrame with a 'Project Name' and a 'Project ID' column, aligned with the input index.
+                      Names without a leading project id get an empty ID, and any leading date is stripped from the name.
     """
-    # Define the regex pattern
-    pattern = r"^(\d{4}-\d{2}-\d{2}) - (.+)$"
-    
-    # Search for the pattern in the input string
-    match = re.match(pattern, input_string)
-    
-    if match:
-        # Extract the four digits and the part after the '-'
-        return match.group(1), match.group(2)
-    else:
-        # Return empty string and the full input string if no match is found
-        return "", input_string
+    ids = names.str.extract(_PROJECT_ID_RE)
+    project_id = ids[0].fillna("")
+    project_name = ids[1].fillna(names)
 
-def list_files_by_subdirectory(directory_path):
+    dates = project_name.str.extract(_PROJECT_DATE_RE)
+    project_name = dates[1].fillna(project_name)
+
+    return pd.DataFrame({'Project Name': project_name, 'Project ID': project_id})
+
+def _scan_files(path):
     """
-    Returns a dictionary where the keys are subdirectories immediately under the given directory path,
-    and the values are lists of the files under each subdirectory.
+    Recursively yields the names of all files under the given directory path.
+
+    Symlinks are skipped. Uses os.scandir so the file type comes from the cached
+    DirEntry rather than a separate stat call per entry. A directory that can't be
+    read is reported and skipped, leaving the rest of the scan intact.
 
     Args:
-        directory_path (str): The path to the directory.
+        path (str): The path to the directory.
 
-    Returns:
-        dict: A dictionary with subdirectories as keys and lists of files under each subdirectory as values.
-              If the provided directory path does not exist or contains no subdirectories, returns an empty dictionary.
+    Yields:
+        str: The name of each file found.
     """
-    result = {}
-    
     try:
-        # List all entries in the given directory
-        entries = os.listdir(directory_path)
-        
-        for entry in entries:
-            entry_path = os.path.join(directory_path, entry)
-            
-            # Check if the entry is a subdirectory
-            if not os.path.isdir(entry_path):
-                continue
-                
-            result[entry] = []
-            # List files in the subdirectory
-            for __ , __ , files in os.walk(entry_path):
-                result[entry] += files
-
-        return result
-
-    except FileNotFoundError:
-        print(f"Error: The directory '{directory_path}' does not exist.")
-        return {}
-    except PermissionError:
-        print(f"Error: Permission denied to access the directory '{directory_path}'.")
-        return {}
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return {}
-
-def filter_dataframe_by_similarity(df, column, target_strings, threshold=0.8):
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        print(f"Error: Could not read the directory '{path}': {e}")
+        return
+
+    for entry in entries:
+        if entry.is_symlink():
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scan_files(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            yield entry.name
+
+def walk_archive(root):
     """
-    Filters a Pandas DataFrame by checking the similarity of a column's values to a list of target strings.
+    Walks the archive in a single scandir pass, yielding every project subdirectory
+    under each year directory along with the files it contains. Year directories and
+    folders inside projects that can't be read are reported and skipped.
 
     Args:
-        df (pd.DataFrame): The DataFrame to filter.
-        column (str): The name of the column to compare.
-        target_strings (list): A list of target strings to compare against.
-        threshold (float): The similarity ratio threshold (0 to 1).
+        root (str): The path to the archive root.
 
-    Returns:
-        pd.DataFrame: A filtered DataFrame containing only rows with similarity above the threshold
-                      for at least one target string.
+    Yields:
+        tuple: A tuple (year, subdir, files) of the year directory name, the project subdirectory
+               name and the list of files under that subdirectory.
     """
-    def is_similar_to_any(value, targets, threshold):
-        """
-        Checks if the value is similar to any of the target strings.
-
-        Args:
-            value (str): The value to compare.
-            targets (list): The list of target strings.
-            threshold (float): The similarity ratio threshold.
+    with os.scandir(root) as years:
+        for year in years:
+            if not year.is_dir():
+                continue
 
-        Returns:
-            bool: True if the value is similar to at least one target string, False otherwise.
-        """
-        for target in targets:
-            if SequenceMatcher(None, value, target).ratio() >= threshold:
-                return True
-        return False
+            try:
+                with os.scandir(year.path) as it:
+                    subdirs = list(it)
+            except OSError as e:
+                print(f"Error: Could not read the directory '{year.path}': {e}")
+                continue
 
-    # Apply the similarity check and filter rows
-    filtered_df = df[df[column].apply(lambda x: is_similar_to_any(x, target_strings, threshold))]
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
 
-    return filtered_df
+                yield year.name, subdir.name, list(_scan_files(subdir.path))
 
-if __name__ == "__main__":
-    root = "C:\\Users\\trist\\OneDrive - Sturgess Solutions\\CPG Archive"
-    output = "C:\\Users\\trist\\OneDrive - Sturgess Solutions\\projects.csv"
+def read_legacy_csv(path):
+    """
+    Reads a project list in the old projects.csv format, where the Files column holds each
+    project's files joined with spaces, and turns Files back into a list of file names.
 
-    project_list = []
+    The split is best effort: a file name containing a space right after one of the known
+    extensions is split in two, and files with other extensions stay attached to the next name.
 
-    entries = os.listdir(root)
-    for entry in entries:
-        entry_path = os.path.join(root, entry)
-            
-        # Check if the entry is a subdirectory
-        if not os.path.isdir(entry_path):
-            continue
-        
-        subdir_files = list_files_by_subdirectory(entry_path)
-        
-        for subdir in subdir_files:
-            project_id, project_name = extract_project_id(subdir)
-            project_date, project_name = extract_project_date(project_name)
-            project_list.append( (project_name, project_id, entry, " ".join(subdir_files[subdir])) )
+    Args:
+        path (str): The path to the legacy CSV file.
 
-    df = pd.DataFrame.from_records(project_list, columns=['Project Name', 'Project ID', 'Year', 'Files'])
-    # df.to_csv(output, index=False)
+    Returns:
+        pd.DataFrame: A DataFrame with 'Project Name', 'Project ID', 'Year' and 'Files' columns.
+    """
+    df = pd.read_csv(path, dtype={'Project Name': str, 'Project ID': str, 'Year': str, 'Files': str}, keep_default_na=False)
+    df['Files'] = [ _LEGACY_FILES_SPLIT_RE.split(files) if files else [] for files in df['Files'] ]
 
-    df = pd.read_csv('E:\\dev\\cpg_bot\\cpg_bot\\data\\projects.csv', dtype={'Project Name': str, 'Project ID': str, 'Year': str, 'Files': str}, keep_default_na=False)
+    return df
 
-    # print( df[ df['Year'] == '2023' ] )
-    # print( df[ df['Project Name'] == 'Kamloops Health Centre' ] )
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the project list the bot loads from the CPG Archive.')
+    parser.add_argument('--root', type=str, default="C:\\Users\\trist\\OneDrive - Sturgess Solutions\\CPG Archive", help='Path to the CPG Archive to scan')
+    parser.add_argument('--from-csv', type=str, help='Convert a legacy projects.csv instead of scanning the archive')
+    parser.add_argument('--output', type=str, default=PROJECTS_PARQUET, help='Path of the Parquet file to write')
+    parser.add_argument('--lookup', type=str, nargs='*', default=[], help='Project names to look up in the written file')
+    args = parser.parse_args()
+
+    if args.from_csv:
+        df = read_legacy_csv(args.from_csv)
+    else:
+        project_list = [ (subdir, year, files) for year, subdir, files in walk_archive(args.root) ]
 
-    test_names = ["City of Burnaby Archive Strategy", "Kamloops Health Centre"]
+        df = pd.DataFrame.from_records(project_list, columns=['Subdirectory', 'Year', 'Files'])
+        df = pd.concat([extract_project_columns(df.pop('Subdirectory')), df], axis=1)
 
-    df = filter_dataframe_by_similarity( df, 'Project Name', test_names )
-    print(df)
+    # Files is kept as a list<string> column rather than a space-joined blob
+    df.to_parquet(args.output, index=False, compression='zstd')
+    print(f"Wrote {len(df)} projects to {args.output}")
 
-    # print( df[ df['Project Name'].isin(test_names) ].to_json(index=False, orient="records") )
-    # [[ 'Project Name', 'Project ID', 'Year' ]]
+    if args.lookup:
+        df = pd.read_parquet(args.output, engine='pyarrow', dtype_backend='pyarrow')
+        print(filter_dataframe_by_similarity( df, 'Project Name', args.lookup, columns=[ 'Project Name', 'Project ID', 'Year' ] ))
@@ -1,12 +1,16 @@
 import os
 import sys
+import asyncio
 import traceback
 import json
+import functools
 from typing import Any, Dict, Optional
 from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+import orjson
 import pandas as pd
-from difflib import SequenceMatcher
 
 from botbuilder.core import MemoryStorage, TurnContext
 from teams import Application, ApplicationOptions, TeamsAdapter
@@ -16,6 +20,7 @@ from teams.state import TurnState
 from teams.feedback_loop_data import FeedbackLoopData
 
 from config import Config
+from utils.similarity import normalize_strings, similarity_mask
 
 config = Config()
 
@@ -34,69 +39,98 @@ bot_app = Application[TurnState](
     )
 )
 
-def filter_dataframe_by_similarity(df, column, target_strings, threshold=0.8):
+def to_json_records(df):
+    return orjson.dumps(df.to_dict(orient="records")).decode()
+
+def read_project_data():
+    # Arrow-backed columns keep Files as a list<string>, so records carry it as plain Python lists
+    # Generated by scripts/list_projects.py
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "projects.parquet")
+    return pd.read_parquet(path, engine='pyarrow', dtype_backend='pyarrow')
+
+# Parse the project list once at startup; every action reads from this frame
+_PROJECTS_DF = read_project_data()
+
+# Year has only a handful of distinct values, so store it as small integer codes
+_PROJECTS_DF['Year'] = _PROJECTS_DF['Year'].astype('category')
+
+# Row positions for each year, so lookups by year don't rescan the Year column
+_YEAR_INDEX = _PROJECTS_DF.groupby('Year', observed=True).indices
+_PROJECT_ID_COLUMNS = _PROJECTS_DF.loc[:, [ 'Project Name', 'Project ID', 'Year' ]]
+_PROJECT_FILE_COLUMNS = _PROJECTS_DF.loc[:, [ 'Project Name', 'Files' ]]
+
+# Row positions for each project name; an exact name resolves to just its own project
+_NAME_INDEX = _PROJECTS_DF.groupby('Project Name').indices
+_NORMALIZED_PROJECT_NAMES = normalize_strings(_PROJECTS_DF['Project Name'])
+
+@functools.lru_cache(maxsize=256)
+def matching_project_rows(project_names):
     """
-    Filters a Pandas DataFrame by checking the similarity of a column's values to a list of target strings.
+    Finds the rows of the project list whose name matches any of the given project names.
+
+    Names that exactly match a project are looked up directly and return only that project's
+    rows, not other projects with similar names; only the remaining names go through the
+    similarity filter. Results are cached, so get_project_ids and
+    get_project_files called for the same names in one turn only match them once.
 
     Args:
-        df (pd.DataFrame): The DataFrame to filter.
-        column (str): The name of the column to compare.
-        target_strings (list): A list of target strings to compare against.
-        threshold (float): The similarity ratio threshold (0 to 1).
+        project_names (tuple): The project names to look up. Must be hashable for the cache.
 
     Returns:
-        pd.DataFrame: A filtered DataFrame containing only rows with similarity above the threshold
-                      for at least one target string.
+        np.ndarray: The sorted, read-only row positions of the matching projects.
     """
-    def is_similar_to_any(value, targets, threshold):
-        """
-        Checks if the value is similar to any of the target strings.
+    rows = [_NAME_INDEX[name] for name in project_names if name in _NAME_INDEX]
+    misses = [name for name in project_names if name not in _NAME_INDEX]
 
-        Args:
-            value (str): The value to compare.
-            targets (list): The list of target strings.
-            threshold (float): The similarity ratio threshold.
+    if misses:
+        rows.append(np.flatnonzero(similarity_mask(_NORMALIZED_PROJECT_NAMES, misses, workers=1)))
 
-        Returns:
-            bool: True if the value is similar to at least one target string, False otherwise.
-        """
-        for target in targets:
-            if SequenceMatcher(None, value, target).ratio() >= threshold:
-                return True
-        return False
+    rows = np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.intp)
 
-    # Apply the similarity check and filter rows
-    filtered_df = df[df[column].apply(lambda x: is_similar_to_any(x, target_strings, threshold))]
+    # The same array is handed to every caller with these names, so don't let one modify it
+    rows.flags.writeable = False
+    return rows
 
-    return filtered_df
+# Pandas and rapidfuzz work runs here so it doesn't block the bot's event loop. Concurrent turns
+# already spread across these threads, so rapidfuzz runs single-threaded inside each one
+_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
 
-def read_project_data():
-    return pd.read_csv("E:\\dev\\cpg_bot\\cpg_bot\\data\\projects.csv", dtype={'Project Name': str, 'Project Name': str, 'Year': str, 'Files': str}, keep_default_na=False)
+def projects_by_year(year):
+    rows = _YEAR_INDEX.get(year, np.empty(0, dtype=np.intp))
+
+    return to_json_records(_PROJECT_ID_COLUMNS.take(rows))
+
+def _project_names_key(project_names):
+    # Order and duplicates don't change the matched rows, so drop them to share cache entries
+    return tuple(sorted(set(project_names)))
+
+def project_ids(project_names):
+    rows = matching_project_rows(_project_names_key(project_names))
+
+    return to_json_records(_PROJECT_ID_COLUMNS.take(rows))
+
+def project_files(project_names):
+    rows = matching_project_rows(_project_names_key(project_names))
+
+    return to_json_records(_PROJECT_FILE_COLUMNS.take(rows))
 
 @bot_app.ai.action("get_projects_by_year")
 async def get_projects_by_year(context: TurnContext, state: TurnState):
-    project_list = read_project_data()
     year = context.data.get("year")
 
-    return project_list[ project_list['Year'] == year ][[ 'Project Name', 'Project ID', 'Year' ]].to_json(index=False, orient="records")
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, projects_by_year, year)
 
 @bot_app.ai.action("get_project_ids")
 async def get_project_ids(context: TurnContext, state: TurnState):
-    project_list = read_project_data()
     project_names = context.data.get("project_names")
 
-    project_list = filter_dataframe_by_similarity( project_list, 'Project Name', project_names )
-
-    return project_list[[ 'Project Name', 'Project ID', 'Year' ]].to_json(index=False, orient="records")
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, project_ids, project_names)
 
 @bot_app.ai.action("get_project_files")
 async def get_project_files(context: TurnContext, state: TurnState):
-    project_list = read_project_data()
     project_names = context.data.get("project_names")
 
-    project_list = filter_dataframe_by_similarity( project_list, 'Project Name', project_names )
-
-    return project_list[[ 'Project Name', 'Files' ]].to_json(index=False, orient="records")
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, project_files, project_names)
 
 @bot_app.error
 async def on_error(context: TurnContext, error: Exception):
@@ -0,0 +1,81 @@
+import re
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import process, fuzz
+
+# Number of target strings scored per cdist call, bounding the score matrix to rows x chunk
+_SIMILARITY_TARGET_CHUNK_SIZE = 100
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+def normalize_strings(values):
+    """
+    Lowercases the given strings and strips punctuation and surrounding whitespace,
+    so that comparisons ignore case and punctuation.
+
+    Args:
+        values (array-like): The strings to normalize.
+
+    Returns:
+        np.ndarray: An object array of the normalized strings.
+    """
+    return pd.Series(values, dtype=object).str.replace(_PUNCTUATION_RE, "", regex=True).str.lower().str.strip().to_numpy(dtype=object)
+
+def similarity_mask(values, target_strings, threshold=0.8, workers=-1):
+    """
+    Checks which of the given values are similar to at least one of a list of target strings.
+
+    The values must already be normalized with normalize_strings, so callers that search the
+    same values repeatedly only normalize them once. The targets are normalized here.
+
+    Args:
+        values (array-like): The normalized strings to compare.
+        target_strings (list): A list of target strings to compare against.
+        threshold (float): The similarity ratio threshold (0 to 1), compared against the Indel ratio.
+        workers (int): The number of threads rapidfuzz scores with; -1 uses all cores. Pass 1 when
+                       calling from a thread pool that already runs lookups in parallel.
+
+    Returns:
+        np.ndarray: A boolean array, True where the value's similarity is above the threshold
+                    for at least one target string.
+    """
+    target_strings = normalize_strings(target_strings)
+
+    score_cutoff = round(threshold * 100)
+    mask = np.zeros(len(values), dtype=bool)
+
+    # Score the values against the targets a chunk at a time; rapidfuzz runs the comparisons in C
+    # on the given number of threads, abandons any comparison that cannot reach the cutoff and stores it as 0
+    for start in range(0, len(target_strings), _SIMILARITY_TARGET_CHUNK_SIZE):
+        scores = process.cdist(values, target_strings[start:start + _SIMILARITY_TARGET_CHUNK_SIZE],
+                               scorer=fuzz.ratio, score_cutoff=score_cutoff, workers=workers, dtype=np.uint8)
+
+        # Keep values that score above the threshold for at least one target
+        mask |= (scores >= score_cutoff).any(axis=1)
+
+    return mask
+
+def filter_dataframe_by_similarity(df, column, target_strings, threshold=0.8, columns=None):
+    """
+    Filters a Pandas DataFrame by checking the similarity of a column's values to a list of target strings.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to filter.
+        column (str): The name of the column to compare.
+        target_strings (list): A list of target strings to compare against.
+        threshold (float): The similarity ratio threshold (0 to 1), compared against the Indel ratio.
+        columns (list, optional): The columns to return. Selecting them together with the rows means
+                                  the other columns are never copied. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: A filtered DataFrame containing only rows with similarity above the threshold
+                      for at least one target string.
+    """
+    values = normalize_strings(df[column])
+    mask = similarity_mask(values, target_strings, threshold)
+
+    if columns is None:
+        return df.loc[mask]
+
+    return df.loc[mask, columns]